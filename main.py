@@ -1,13 +1,20 @@
 import argparse
+import asyncio
 import base64
+import functools
+import importlib
+import io
 import os
+import re
 import shutil
 import subprocess
 import sys
 import tempfile
 import threading
 import tkinter as tk
+import uuid
 import webbrowser
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from tkinter import filedialog, messagebox, ttk
@@ -30,9 +37,27 @@ try:
 except ImportError:
     HAVE_PYQT = False
 
+# mistune为可选依赖，安装后用于加速预览渲染
+try:
+    import mistune
+
+    # 旧版mistune（0.x/2.x）没有所需的create_markdown接口或math插件
+    HAVE_MISTUNE = int(mistune.__version__.split(".")[0]) >= 3
+except (ImportError, AttributeError, ValueError):
+    HAVE_MISTUNE = False
+
 # 支持的图片扩展名列表
 SUPPORTED_IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff", ".tif", ".webp"}
 
+# Markdown图片链接 ![alt](url)
+_MARKDOWN_IMAGE_PATTERN = re.compile(r"!\[([^\]]*)\]\(([^)]+)\)")
+
+# 文本预览格式化使用的预编译正则
+_HEADING = re.compile(r"(#{1,4}) (.*)")
+_BULLET = re.compile(r"[-*] (.*)")
+_QUOTE = re.compile(r"> (.*)")
+_IMG = re.compile(r"!\[([^\]]*)\]\([^)]*\)")
+
 
 # 告知用户安装必要的库
 def show_install_message(missing_library, additional_info=""):
@@ -56,15 +81,24 @@ def show_simple_dependencies_message():
 - mistralai, img2pdf, Pillow: 核心OCR功能
 - markdown, md4mathjax, markdown-extra: 预览功能
 - PyQt5, PyQtWebEngine: 可选的增强预览功能
+- mistune: 可选，加速大文档的预览渲染
 
 如有功能问题，请确保所有依赖已正确安装。
 """
 
 
 def replace_images_in_markdown(markdown_str: str, images_dict: dict) -> str:
-    for img_name, img_path in images_dict.items():
-        markdown_str = markdown_str.replace(f"![{img_name}]({img_name})", f"![{img_name}]({img_path})")
-    return markdown_str
+    if not images_dict:
+        return markdown_str
+
+    def repl(match):
+        # 优先按链接地址匹配，其次按alt文本匹配
+        img_path = images_dict.get(match.group(2)) or images_dict.get(match.group(1))
+        if img_path is None:
+            return match.group(0)
+        return f"![{match.group(1)}]({img_path})"
+
+    return _MARKDOWN_IMAGE_PATTERN.sub(repl, markdown_str)
 
 
 def create_output_directory(original_file_path):
@@ -74,56 +108,70 @@ def create_output_directory(original_file_path):
 
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     source_file = Path(original_file_path)
-    output_dir = os.path.join(outputs_base, f"{timestamp}_{source_file.stem}")
+    # 多个线程可能在同一秒内处理同名文件，附加随机后缀避免目录冲突
+    output_dir = os.path.join(outputs_base, f"{timestamp}_{source_file.stem}_{uuid.uuid4().hex[:6]}")
     os.makedirs(output_dir, exist_ok=True)
 
     return output_dir
 
 
+def _decode_and_write(img_path: str, image_base64: str) -> None:
+    """解码base64图片数据并写入文件"""
+    # 去掉data URI前缀，没有前缀时整个字符串即为base64数据
+    head, sep, tail = image_base64.partition(",")
+    Path(img_path).write_bytes(base64.b64decode(tail if sep else head))
+
+
 def save_ocr_results(ocr_response: OCRResponse, output_dir: str) -> None:
     images_dir = os.path.join(output_dir, "images")
     os.makedirs(images_dir, exist_ok=True)
 
-    all_markdowns = []
-    for page in ocr_response.pages:
-        page_images = {}
-        for img in page.images:
-            img_data = base64.b64decode(img.image_base64.split(",")[1])
-            img_path = os.path.join(images_dir, f"{img.id}.png")
-            with open(img_path, "wb") as f:
-                f.write(img_data)
-            page_images[img.id] = f"images/{img.id}.png"
-
-        page_markdown = replace_images_in_markdown(page.markdown, page_images)
-        all_markdowns.append(page_markdown)
-
-    markdown_content = "\n\n".join(all_markdowns)
-    with open(os.path.join(output_dir, "complete.md"), "w", encoding="utf-8") as f:
-        f.write(markdown_content)
-
+    # 图片在线程池中解码写入，同时在当前线程逐页写出Markdown
+    buffer = io.StringIO()
+    with (
+        ThreadPoolExecutor(max_workers=os.cpu_count()) as executor,
+        open(os.path.join(output_dir, "complete.md"), "w", encoding="utf-8") as f,
+    ):
+        write_futures = []
+        for i, page in enumerate(ocr_response.pages):
+            page_images = {}
+            for img in page.images:
+                img_path = os.path.join(images_dir, f"{img.id}.png")
+                write_futures.append(executor.submit(_decode_and_write, img_path, img.image_base64))
+                page_images[img.id] = f"images/{img.id}.png"
+
+            page_markdown = replace_images_in_markdown(page.markdown, page_images)
+            if i > 0:
+                f.write("\n\n")
+                buffer.write("\n\n")
+            f.write(page_markdown)
+            buffer.write(page_markdown)
+
+        # 等待所有图片写入完成，并传播写入错误
+        for future in write_futures:
+            future.result()
+
+    markdown_content = buffer.getvalue()
     return markdown_content, output_dir
 
 
-def is_image_file(file_path):
-    """检查文件是否为支持的图片格式"""
+def inspect_image(file_path) -> str | None:
+    """检查文件是否为支持的图片格式，返回图片格式，不是图片时返回None"""
     ext = os.path.splitext(file_path.lower())[1]
     if ext not in SUPPORTED_IMAGE_EXTENSIONS:
-        return False
+        return None
 
+    # 只读取文件头识别格式，不解码图像数据
     try:
         with Image.open(file_path) as img:
-            return img.format is not None
+            return img.format
     except Exception:
-        return False
+        return None
 
 
-def get_image_format(file_path):
-    """获取图片格式"""
-    try:
-        with Image.open(file_path) as img:
-            return img.format or "未知"
-    except Exception:
-        return "未知"
+def is_image_file(file_path):
+    """检查文件是否为支持的图片格式"""
+    return inspect_image(file_path) is not None
 
 
 def convert_image_to_pdf(image_path, output_dir):
@@ -138,12 +186,12 @@ def convert_image_to_pdf(image_path, output_dir):
         raise Exception(f"图片转换为PDF失败: {str(e)}")
 
 
-def process_file(file_path: str, api_key: str) -> tuple:
-    """处理文件（PDF或图片），返回处理结果"""
+def _prepare_file(file_path: str) -> tuple:
+    """创建输出目录并备份源文件，图片会转换为PDF，返回待处理的PDF路径和输出目录"""
     output_dir = create_output_directory(file_path)
 
     origin_file = os.path.join(output_dir, f"origin{Path(file_path).suffix}")
-    shutil.copy2(file_path, origin_file)
+    shutil.copyfile(file_path, origin_file)
 
     if is_image_file(file_path):
         pdf_path = convert_image_to_pdf(file_path, output_dir)
@@ -151,83 +199,272 @@ def process_file(file_path: str, api_key: str) -> tuple:
     else:
         file_to_process = origin_file
 
+    return file_to_process, output_dir
+
+
+def process_file(file_path: str, api_key: str) -> tuple:
+    """处理文件（PDF或图片），返回处理结果"""
+    file_to_process, output_dir = _prepare_file(file_path)
     return process_pdf(file_to_process, api_key, output_dir=output_dir)
 
 
-def process_pdf(pdf_path: str, api_key: str, output_dir: str = None) -> tuple:
-    """处理PDF文件，生成OCR结果"""
-    if output_dir is None:
-        output_dir = create_output_directory(pdf_path)
-        origin_file = os.path.join(output_dir, f"origin{Path(pdf_path).suffix}")
-        shutil.copy2(pdf_path, origin_file)
+def _stage_file(client: Mistral, file_path: str) -> tuple:
+    """预处理并上传文件，返回文件ID和输出目录，供随后签名并进行OCR"""
+    file_to_process, output_dir = _prepare_file(file_path)
+    file_id = _upload(client, file_to_process)
+    return file_id, output_dir
 
-    client = Mistral(api_key=api_key)
 
+def _discard_staged_file(client: Mistral, future) -> None:
+    """丢弃预先上传但不再处理的文件，删除已上传的文件和本地输出目录"""
+    if future.cancel():
+        return
+    try:
+        file_id, staged_dir = future.result()
+    except Exception:
+        return
+
+    shutil.rmtree(staged_dir, ignore_errors=True)
+    try:
+        client.files.delete(file_id=file_id)
+    except Exception as e:
+        print(f"删除已上传的文件 {file_id} 时出错: {str(e)}")
+
+
+async def process_file_async(file_path: str, client: Mistral) -> tuple:
+    """process_file的异步版本，多个文件可共享同一个client并发处理"""
+    file_to_process, output_dir = await asyncio.to_thread(_prepare_file, file_path)
+    return await process_pdf_async(file_to_process, client, output_dir)
+
+
+@functools.lru_cache(maxsize=4)
+def _get_client(api_key: str) -> Mistral:
+    """按API密钥复用Mistral客户端，以便多次请求共享连接池"""
+    return Mistral(api_key=api_key)
+
+
+# 签名URL有效期（小时）及使用的OCR模型
+SIGNED_URL_EXPIRY = 1
+OCR_MODEL = "mistral-ocr-latest"
+
+
+def _upload_file_payload(pdf_path: str) -> dict:
+    """读取PDF文件，构建上传请求的文件参数"""
     pdf_file = Path(pdf_path)
     if not pdf_file.is_file():
         raise FileNotFoundError(f"文件不存在: {pdf_path}")
 
-    uploaded_file = client.files.upload(
-        file={
-            "file_name": pdf_file.stem,
-            "content": pdf_file.read_bytes(),
-        },
-        purpose="ocr",
-    )
+    return {
+        "file_name": pdf_file.stem,
+        "content": pdf_file.read_bytes(),
+    }
 
-    signed_url = client.files.get_signed_url(file_id=uploaded_file.id, expiry=1)
-    pdf_response = client.ocr.process(
-        document=DocumentURLChunk(document_url=signed_url.url), model="mistral-ocr-latest", include_image_base64=True
-    )
+
+def _ocr_request(url: str) -> dict:
+    """构建OCR请求参数"""
+    return {
+        "document": DocumentURLChunk(document_url=url),
+        "model": OCR_MODEL,
+        "include_image_base64": True,
+    }
+
+
+def _upload(client: Mistral, pdf_path: str) -> str:
+    """上传PDF文件，返回文件ID"""
+    uploaded_file = client.files.upload(file=_upload_file_payload(pdf_path), purpose="ocr")
+    return uploaded_file.id
+
+
+def _sign(client: Mistral, file_id: str) -> str:
+    """获取已上传文件的签名URL"""
+    signed_url = client.files.get_signed_url(file_id=file_id, expiry=SIGNED_URL_EXPIRY)
+    return signed_url.url
+
+
+def _ocr(client: Mistral, url: str) -> OCRResponse:
+    """对签名URL指向的文档进行OCR识别"""
+    return client.ocr.process(**_ocr_request(url))
+
+
+async def _upload_async(client: Mistral, pdf_path: str) -> str:
+    """_upload的异步版本"""
+    payload = await asyncio.to_thread(_upload_file_payload, pdf_path)
+    uploaded_file = await client.files.upload_async(file=payload, purpose="ocr")
+    return uploaded_file.id
+
+
+async def _sign_async(client: Mistral, file_id: str) -> str:
+    """_sign的异步版本"""
+    signed_url = await client.files.get_signed_url_async(file_id=file_id, expiry=SIGNED_URL_EXPIRY)
+    return signed_url.url
+
+
+async def _ocr_async(client: Mistral, url: str) -> OCRResponse:
+    """_ocr的异步版本"""
+    return await client.ocr.process_async(**_ocr_request(url))
+
+
+def process_pdf(pdf_path: str, api_key: str, output_dir: str = None) -> tuple:
+    """处理PDF文件，生成OCR结果"""
+    if output_dir is None:
+        output_dir = create_output_directory(pdf_path)
+        origin_file = os.path.join(output_dir, f"origin{Path(pdf_path).suffix}")
+        shutil.copyfile(pdf_path, origin_file)
+
+    client = _get_client(api_key)
+
+    file_id = _upload(client, pdf_path)
+    url = _sign(client, file_id)
+    pdf_response = _ocr(client, url)
 
     markdown_content, output_dir = save_ocr_results(pdf_response, output_dir)
     return markdown_content, output_dir
 
 
+async def process_pdf_async(pdf_path: str, client: Mistral, output_dir: str) -> tuple:
+    """process_pdf的异步版本，使用client的异步接口以便在事件循环中并发请求"""
+    file_id = await _upload_async(client, pdf_path)
+    url = await _sign_async(client, file_id)
+    pdf_response = await _ocr_async(client, url)
+
+    return await asyncio.to_thread(save_ocr_results, pdf_response, output_dir)
+
+
+async def _process_files_async(file_paths: list, api_key: str, concurrency: int) -> None:
+    """并发处理多个文件，所有请求共享同一个client的连接池"""
+    client = _get_client(api_key)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(file_path):
+        async with semaphore:
+            try:
+                _, output_dir = await process_file_async(file_path, client)
+                print(f"{file_path} OCR处理完成。结果保存在: {output_dir}")
+            except Exception as e:
+                print(f"处理文件 {file_path} 时出错: {str(e)}")
+
+    await asyncio.gather(*(run(file_path) for file_path in file_paths))
+
+
 # 简单的Markdown格式化器，用于文本预览
 def format_markdown_for_text_preview(markdown_text):
     """
     将Markdown文本转换为简单的格式化文本以供预览
     这个函数实现简单的Markdown到文本的转换，以提供基本的可读性
     """
-    lines = markdown_text.split("\n")
     formatted_lines = []
+    append = formatted_lines.append
 
-    for line in lines:
+    for line in markdown_text.split("\n"):
         # 处理标题
-        if line.startswith("# "):
-            formatted_lines.append(f"\n{line[2:].upper()}\n{'=' * len(line[2:])}")
-        elif line.startswith("## "):
-            formatted_lines.append(f"\n{line[3:].upper()}\n{'-' * len(line[3:])}")
-        elif line.startswith("### "):
-            formatted_lines.append(f"\n{line[4:]}\n{'~' * len(line[4:])}")
-        elif line.startswith("#### "):
-            formatted_lines.append(f"\n{line[5:]}")
+        m = _HEADING.fullmatch(line) if line[:1] == "#" else None
+        if m:
+            level, title = len(m.group(1)), m.group(2)
+            if level == 1:
+                append(f"\n{title.upper()}\n{'=' * len(title)}")
+            elif level == 2:
+                append(f"\n{title.upper()}\n{'-' * len(title)}")
+            elif level == 3:
+                append(f"\n{title}\n{'~' * len(title)}")
+            else:
+                append(f"\n{title}")
+            continue
+
+        stripped = line.strip()
+        first = stripped[:1]
         # 处理列表
-        elif line.strip().startswith("- "):
-            formatted_lines.append(f"  • {line.strip()[2:]}")
-        elif line.strip().startswith("* "):
-            formatted_lines.append(f"  • {line.strip()[2:]}")
+        m = _BULLET.match(stripped) if first == "-" or first == "*" else None
+        if m:
+            append(f"  • {m.group(1)}")
+            continue
         # 处理引用
-        elif line.strip().startswith("> "):
-            formatted_lines.append(f"  | {line.strip()[2:]}")
+        m = _QUOTE.match(stripped) if first == ">" else None
+        if m:
+            append(f"  | {m.group(1)}")
+            continue
         # 处理代码块
-        elif line.strip().startswith("```"):
-            formatted_lines.append("-" * 40)  # 简单分隔符
+        if first == "`" and stripped.startswith("```"):
+            append("-" * 40)  # 简单分隔符
+            continue
         # 处理图片链接 ![alt](url)
-        elif "![" in line and "](" in line:
-            img_alt = line.split("![")[1].split("]")[0]
-            formatted_lines.append(f"[图片: {img_alt}]")
+        m = _IMG.search(line) if "![" in line else None
+        if m:
+            append(f"[图片: {m.group(1)}]")
         # 其他行保持不变
         else:
-            formatted_lines.append(line)
+            append(line)
 
     return "\n".join(formatted_lines)
 
 
-# HTML模板创建函数，避免重复代码
-def create_html_content(markdown_content, output_dir=None):
-    """创建用于预览的HTML内容"""
+# Markdown解析器实例不是线程安全的，后台渲染时需加锁
+_MARKDOWN_LOCK = threading.Lock()
+
+
+# mistune渲染结果包含公式时追加的MathJax脚本，与md4mathjax的做法一致
+_MATHJAX_SCRIPT = """<script>
+window.MathJax = {tex: {inlineMath: [["$", "$"], ["\\\\(", "\\\\)"]]}};
+</script>
+<script id="MathJax-script" src="https://cdn.jsdelivr.net/npm/mathjax@3/es5/tex-mml-chtml.js"></script>
+"""
+
+# LaTeX风格的公式分隔符 \(...\) 和 \[...\]
+_LATEX_MATH_PATTERN = r"\\\((?P<latex_inline_math>[\s\S]+?)\\\)|\\\[(?P<latex_display_math>[\s\S]+?)\\\]"
+
+
+def _parse_latex_math(inline, m, state):
+    """将LaTeX风格的公式解析为mistune math插件的公式标记"""
+    text = m.group("latex_display_math")
+    if text is not None:
+        state.append_token({"type": "block_math", "raw": text})
+    else:
+        state.append_token({"type": "inline_math", "raw": m.group("latex_inline_math")})
+    return m.end()
+
+
+def _mistune_latex_math(md):
+    """mistune插件：支持md4mathjax同样识别的 \\(...\\) 和 \\[...\\] 分隔符"""
+    # 需在转义规则之前匹配，否则反斜杠会被当作转义字符去掉
+    md.inline.register("latex_math", _LATEX_MATH_PATTERN, _parse_latex_math, before="escape")
+
+
+@functools.cache
+def _get_markdown_renderer():
+    """创建并复用Markdown渲染函数，避免每次转换都重新加载扩展"""
+    if HAVE_MISTUNE:
+        # mistune比markdown库快得多，math插件输出兼容MathJax的公式标记
+        try:
+            md = mistune.create_markdown(
+                # 允许file://链接，预览中的图片使用本地绝对路径
+                renderer=mistune.HTMLRenderer(escape=False, allow_harmful_protocols=("file:",)),
+                plugins=["math", "table", "strikethrough", "url", "footnotes", "def_list", "abbr", _mistune_latex_math],
+            )
+        except Exception as e:
+            # mistune不可用时回退到Python markdown库
+            print(f"注意: mistune初始化失败，使用markdown库渲染。错误信息: {str(e)}")
+        else:
+
+            def render(text):
+                html = md(text)
+                if 'class="math"' in html:
+                    html += _MATHJAX_SCRIPT
+                return html
+
+            return render
+
+    try:
+        # 同时使用md4mathjax和extra扩展来支持数学公式和增强的Markdown格式
+        md = markdown.Markdown(extensions=["md4mathjax", "extra"])
+    except (ImportError, ValueError):
+        # 如果md4mathjax不可用，尝试仅使用extra
+        print("注意: md4mathjax扩展不可用，数学公式可能无法正确渲染")
+        md = markdown.Markdown(extensions=["extra"])
+    return lambda text: md.reset().convert(text)
+
+
+@functools.lru_cache(maxsize=2)
+def _render_markdown(markdown_content, output_dir=None):
+    """将Markdown转换为HTML正文，相同内容重复预览时直接使用缓存结果"""
     output_dir_safe = output_dir.replace(os.sep, "/") if output_dir else ""
 
     if output_dir:
@@ -235,19 +472,23 @@ def create_html_content(markdown_content, output_dir=None):
     else:
         processed_markdown = markdown_content
 
-    # 使用Python markdown库转换为HTML，使用md4mathjax和extra扩展
+    # 优先使用mistune，不可用时使用Python markdown库转换为HTML
     try:
-        # 同时使用md4mathjax和extra扩展来支持数学公式和增强的Markdown格式
-        html_body = markdown.markdown(processed_markdown, extensions=["md4mathjax", "extra"])
-    except (ImportError, ValueError):
-        # 如果md4mathjax不可用，尝试仅使用extra
-        try:
-            html_body = markdown.markdown(processed_markdown, extensions=["extra"])
-            print("注意: md4mathjax扩展不可用，数学公式可能无法正确渲染")
-        except Exception as e:
-            # 如果markdown库或扩展完全不可用，使用简单的HTML转义
-            html_body = processed_markdown.replace("<", "&lt;").replace(">", "&gt;")
-            print(f"警告: markdown转换出错，使用基本HTML转义。错误信息: {str(e)}")
+        with _MARKDOWN_LOCK:
+            html_body = _get_markdown_renderer()(processed_markdown)
+    except Exception as e:
+        # 如果markdown库或扩展完全不可用，使用简单的HTML转义
+        html_body = processed_markdown.replace("<", "&lt;").replace(">", "&gt;")
+        print(f"警告: markdown转换出错，使用基本HTML转义。错误信息: {str(e)}")
+
+    # 图片延迟加载，只有滚动到可视区域附近时才读取
+    return html_body.replace("<img ", '<img loading="lazy" decoding="async" ')
+
+
+# HTML模板创建函数，避免重复代码
+def create_html_content(markdown_content, output_dir=None):
+    """创建用于预览的HTML内容"""
+    html_body = _render_markdown(markdown_content, output_dir)
 
     # HTML模板 - 包含MathJax支持
     html_template = """<!DOCTYPE html>
@@ -350,10 +591,17 @@ class MarkdownPreviewApp(tk.Tk):
         self.geometry("1200x800")
 
         self.api_key = os.environ.get("MISTRAL_API_KEY", "")
+        if self.api_key:
+            # 预先创建客户端，首次处理文件时无需再构建
+            _get_client(self.api_key)
 
         self.create_widgets()
         self.current_output_dir = None
         self.temp_html_path = None
+        self._debounce_id = None
+        self._render_generation = 0
+        self._last_source = None
+        self._source_dirty = True
 
         # 检查所需库是否安装
         self.check_dependencies()
@@ -364,18 +612,18 @@ class MarkdownPreviewApp(tk.Tk):
 
         # 检查markdown库
         try:
-            import markdown
+            importlib.import_module("markdown")
 
             # 检查md4mathjax扩展
             try:
-                markdown.markdown("test", extensions=["md4mathjax"])
-            except (ImportError, ValueError):
+                importlib.import_module("md4mathjax")
+            except ImportError:
                 missing_libraries.append("md4mathjax")
 
             # 检查extra扩展
             try:
-                markdown.markdown("test", extensions=["extra"])
-            except (ImportError, ValueError):
+                importlib.import_module("markdown.extensions.extra")
+            except ImportError:
                 missing_libraries.append("markdown-extra")
 
         except ImportError:
@@ -506,6 +754,7 @@ class MarkdownPreviewApp(tk.Tk):
         # Markdown编辑区域
         self.source_text = ScrolledText(self.source_frame, wrap=tk.WORD, width=80, height=20, font=("Courier", 12))
         self.source_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.source_text.bind("<<Modified>>", self._on_source_modified)
 
         # 创建PyQt预览窗口（如果可用）
         if HAVE_PYQT:
@@ -585,8 +834,8 @@ class MarkdownPreviewApp(tk.Tk):
             self.file_path_var.set(file_path)
 
             # 检查文件类型并更新显示
-            if is_image_file(file_path):
-                img_format = get_image_format(file_path)
+            img_format = inspect_image(file_path)
+            if img_format is not None:
                 file_type = f"图片文件 ({img_format})"
                 self.file_type_var.set(file_type)
                 self.status_var.set(
@@ -651,6 +900,9 @@ class MarkdownPreviewApp(tk.Tk):
         # 清空并更新源码区域
         self.source_text.delete(1.0, tk.END)
         self.source_text.insert(tk.END, markdown_content)
+        # 程序写入的内容随后会直接刷新预览，无需再触发编辑后的延迟刷新
+        self.source_text.edit_modified(False)
+        self._source_dirty = True
 
         # 更新状态
         file_name = os.path.basename(self.file_path_var.get())
@@ -683,30 +935,80 @@ class MarkdownPreviewApp(tk.Tk):
         self.progress_bar.stop()
         self.progress_var.set(0)
 
+    def _on_source_modified(self, event=None):
+        """源码编辑后延迟刷新预览，连续编辑时只渲染最后一次"""
+        if not self.source_text.edit_modified():
+            return
+        self.source_text.edit_modified(False)
+        self._source_dirty = True
+
+        # 仅在预览窗口可见时自动刷新
+        if not (HAVE_PYQT and hasattr(self, "web_bridge") and self.web_bridge.is_visible):
+            return
+
+        if self._debounce_id is not None:
+            self.after_cancel(self._debounce_id)
+        self._debounce_id = self.after(250, self._do_refresh)
+
+    def _get_source_text(self):
+        """获取源码区域的内容，未修改时复用上次读取的结果"""
+        if self._source_dirty or self._last_source is None or self.source_text.edit_modified():
+            self._last_source = self.source_text.get(1.0, tk.END)
+            self._source_dirty = False
+        return self._last_source
+
+    def _do_refresh(self):
+        """执行延迟的预览刷新"""
+        self._debounce_id = None
+        self.refresh_preview()
+
     def refresh_preview(self):
         """刷新Markdown预览"""
         if not hasattr(self, "source_text"):
             return
 
+        # 取消尚未执行的延迟刷新
+        if self._debounce_id is not None:
+            self.after_cancel(self._debounce_id)
+            self._debounce_id = None
+
         # 获取当前Markdown内容
-        markdown_content = self.source_text.get(1.0, tk.END)
+        markdown_content = self._get_source_text()
 
         if HAVE_PYQT and hasattr(self, "web_bridge"):
-            # 如果有PyQt WebEngine，则更新它的内容
-            html_content = create_html_content(markdown_content, self.current_output_dir)
-            self.web_bridge.load_html(html_content)
-
-            # 自动显示预览窗口
-            if self.current_output_dir and not self.web_bridge.is_visible:
-                self.web_bridge.show()
-                if hasattr(self, "toggle_preview_button"):
-                    self.toggle_preview_button.config(text="隐藏预览窗口")
-
-            self.status_var.set("预览已更新 - 使用预览窗口查看格式化内容")
+            # 在后台线程中渲染HTML，只有最新一次请求的结果会被应用
+            self._render_generation += 1
+            threading.Thread(
+                target=self._render_preview_bg,
+                args=(markdown_content, self.current_output_dir, self._render_generation),
+                daemon=True,
+            ).start()
+            self.status_var.set("正在更新预览...")
         else:
             # 没有PyQt时，提示用户使用浏览器预览
             self.status_var.set("请使用'在浏览器中预览'按钮查看格式化内容")
 
+    def _render_preview_bg(self, markdown_content, output_dir, generation):
+        """在后台线程中生成预览HTML"""
+        html_content = create_html_content(markdown_content, output_dir)
+        self.after(0, lambda: self._apply_preview(html_content, generation))
+
+    def _apply_preview(self, html_content, generation):
+        """在UI线程中加载渲染好的HTML，忽略已过期的渲染结果"""
+        if generation != self._render_generation:
+            return
+
+        # 更新PyQt WebEngine的内容
+        self.web_bridge.load_html(html_content)
+
+        # 自动显示预览窗口
+        if self.current_output_dir and not self.web_bridge.is_visible:
+            self.web_bridge.show()
+            if hasattr(self, "toggle_preview_button"):
+                self.toggle_preview_button.config(text="隐藏预览窗口")
+
+        self.status_var.set("预览已更新 - 使用预览窗口查看格式化内容")
+
     def open_output_folder(self):
         """打开输出文件夹"""
         if not self.current_output_dir or not os.path.exists(self.current_output_dir):
@@ -731,7 +1033,7 @@ class MarkdownPreviewApp(tk.Tk):
             return
 
         # 获取Markdown内容
-        markdown_content = self.source_text.get(1.0, tk.END)
+        markdown_content = self._get_source_text()
 
         # 创建一个临时HTML文件
         with tempfile.NamedTemporaryFile(delete=False, suffix=".html") as f:
@@ -785,6 +1087,12 @@ def main_cli():
         action="store_true",
         help="自动处理所有文件，不需要确认",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="自动模式下同时处理的文件数量，默认为8",
+    )
     parser.add_argument(
         "--gui",
         action="store_true",
@@ -800,26 +1108,48 @@ def main_cli():
     if not args.api_key:
         raise ValueError("未提供API密钥，请设置MISTRAL_API_KEY环境变量或使用--api-key参数")
 
-    # 处理所有输入的文件
-    for i, file_path in enumerate(args.files):
+    # 自动模式下并发处理所有文件，OCR 主要耗时在网络请求上
+    if args.auto:
+        asyncio.run(_process_files_async(args.files, args.api_key, args.concurrency))
+        return
+
+    # 交互模式下逐个处理文件，每个文件完成后询问用户是否继续
+    # 当前文件进行OCR时，在后台线程中预先上传下一个文件
+    # 签名URL有时效，等到真正进行OCR前才获取
+    client = _get_client(args.api_key)
+    with ThreadPoolExecutor(max_workers=1) as uploader:
+        next_future = uploader.submit(_stage_file, client, args.files[0])
         try:
-            print(f"开始处理文件 {i + 1}/{len(args.files)}: {file_path}")
-            markdown_content, output_dir = process_file(file_path, args.api_key)
-            print(f"OCR处理完成。结果保存在: {output_dir}")
-
-            # 如果不是最后一个文件且不是自动模式，则询问用户是否继续
-            if i < len(args.files) - 1 and not args.auto:
-                response = input(f"\n已完成 {file_path} 的处理。按回车键处理下一个文件，或输入'q'退出: ")
-                if response.lower() == "q":
-                    print("用户选择退出程序。")
-                    break
-        except Exception as e:
-            print(f"处理文件 {file_path} 时出错: {str(e)}")
-            if not args.auto and i < len(args.files) - 1:
-                response = input(f"\n处理 {file_path} 时出错。按回车键处理下一个文件，或输入'q'退出: ")
-                if response.lower() == "q":
-                    print("用户选择退出程序。")
-                    break
+            for i, file_path in enumerate(args.files):
+                future = next_future
+                next_future = None
+                if i < len(args.files) - 1:
+                    next_future = uploader.submit(_stage_file, client, args.files[i + 1])
+
+                try:
+                    print(f"开始处理文件 {i + 1}/{len(args.files)}: {file_path}")
+                    file_id, output_dir = future.result()
+                    pdf_response = _ocr(client, _sign(client, file_id))
+                    markdown_content, output_dir = save_ocr_results(pdf_response, output_dir)
+                    print(f"OCR处理完成。结果保存在: {output_dir}")
+
+                    # 如果不是最后一个文件，则询问用户是否继续
+                    if i < len(args.files) - 1:
+                        response = input(f"\n已完成 {file_path} 的处理。按回车键处理下一个文件，或输入'q'退出: ")
+                        if response.lower() == "q":
+                            print("用户选择退出程序。")
+                            break
+                except Exception as e:
+                    print(f"处理文件 {file_path} 时出错: {str(e)}")
+                    if i < len(args.files) - 1:
+                        response = input(f"\n处理 {file_path} 时出错。按回车键处理下一个文件，或输入'q'退出: ")
+                        if response.lower() == "q":
+                            print("用户选择退出程序。")
+                            break
+        finally:
+            # 用户提前退出或中断时，清理已为下一个文件预先上传的内容
+            if next_future is not None:
+                _discard_staged_file(client, next_future)
 
 
 def main():